@@ -22,11 +22,9 @@ class CmdLookWithMap(Command):
         if not location:
             caller.msg("You are nowhere.")
             return
-        
-        # Display the map by executing the 'map' command
-        caller.execute_cmd("map")
-        
-        # Show the regular room description (default Evennia behavior)
+
+        # Show the regular room description (default Evennia behavior). The map is
+        # already part of this, rendered by the room's `get_display_header`.
         description = location.return_appearance(caller)
         caller.msg(description)
 
@@ -94,14 +94,14 @@ AMP_PORT = 8008
 # This is a security setting protecting against host poisoning
 # attacks.  It defaults to allowing all. In production, make
 # sure to change this to your actual host addresses/IPs.
-ALLOWED_HOSTS = ['192.168.88.50', 'mud.jbhlmh.ca', '192.168.88.20', '192.168.88.10']
+ALLOWED_HOSTS = ('192.168.88.50', 'mud.jbhlmh.ca', '192.168.88.20', '192.168.88.10')
 # The url address to your server, like mymudgame.com. This should be the publicly
 # visible location. This is used e.g. on the web site to show how you connect to the
 # game over telnet. Default is localhost (only on your machine).
 SERVER_HOSTNAME = "mud.jbhlmh.ca"
 # This needs to be set to your website address for django or you'll receive a
 # CSRF error when trying to log on to the web portal
-CSRF_TRUSTED_ORIGINS = ['https://mud.jbhlmh.ca']
+CSRF_TRUSTED_ORIGINS = ('https://mud.jbhlmh.ca',)
 
 # Discord integration support
 DISCORD_ENABLED = True
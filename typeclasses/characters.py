@@ -19,4 +19,3 @@ class Character(DefaultCharacter):
     properties and methods available on all Object child classes like this.
 
     """
-    pass
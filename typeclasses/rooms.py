@@ -20,5 +20,3 @@ class Room(ObjectParent, DefaultRoom):
     See mygame/typeclasses/objects.py for a list of
     properties and methods available on all Objects.
     """
-
-    pass
\ No newline at end of file
@@ -1,5 +1,8 @@
+from django.db import transaction
 from evennia import DefaultAccount, create_object
 
+_EXIT_TYPECLASS = "world.rooms.suexits.SUExit"
+
 class SUAccount(DefaultAccount):
     """
     Custom account class to create and link shared rooms for the account.
@@ -7,50 +10,91 @@ class SUAccount(DefaultAccount):
 
     def at_account_creation(self):
         """
-        Called when a new account is created. Sets up shared rooms and connects them with exits.
+        Called when a new account is created. The shared rooms are not created here but
+        the first time one of them is accessed (see `house`, `armoury` and `rift`), so
+        accounts that never enter the game don't pay for them.
         """
-        # Create the House or Home
-        house = create_object("world.rooms.rooms.SUHouse", key=f"{self.key}'s House")
-        house.db.desc = "This is your cozy home. It feels warm and welcoming."
-        house.tags.add("shared_room")
-        self.db.house = house
-
-        # Create the Armoury
-        armoury = create_object("world.rooms.rooms.SUArmoury", key=f"{self.key}'s Armoury")
-        armoury.db.desc = "This is a secure room where you can store items and currency."
-        armoury.tags.add("shared_room")
-        self.db.armoury = armoury
-
-        # Create the Rift
-        rift = create_object("world.rooms.rooms.SURift", key=f"{self.key}'s Rift")
-        rift.db.desc = "A mysterious room with portals leading to different parts of the world."
-        rift.tags.add("shared_room")
-        self.db.rift = rift
-
-        # Connect the rooms with two-way exits
-        self._create_exits(house, armoury, "Armoury", "House")
-        self._create_exits(armoury, rift, "Rift", "Armoury")
-        self._create_exits(rift, house, "House", "Rift")
 
-        # Notify the account
-        self.msg("Shared rooms have been created and connected for your account.")
+    @property
+    def house(self):
+        """The account's House, created on first access."""
+        return self._get_shared_room("house")
+
+    @property
+    def armoury(self):
+        """The account's Armoury, created on first access."""
+        return self._get_shared_room("armoury")
+
+    @property
+    def rift(self):
+        """The account's Rift, created on first access."""
+        return self._get_shared_room("rift")
 
-    def _create_exits(self, room_from, room_to, exit_to_name, exit_from_name):
+    def _get_shared_room(self, name):
         """
-        Helper method to create two-way exits between rooms.
+        Get one of the account's shared rooms, setting them all up if this account
+        doesn't have them yet. Rooms are cached on the account once looked up, but a
+        cached room that has been deleted since is looked up (or rebuilt) again.
+
+        Args:
+            name (str): One of `house`, `armoury` or `rift`.
+
+        Returns:
+            Room: The shared room.
+        """
+        rooms = self.ndb.shared_rooms
+        if rooms is None:
+            rooms = self.ndb.shared_rooms = {}
+        room = rooms.get(name)
+        if not (room and room.id):
+            if not self.db.house:
+                self._build_shared_rooms()
+            room = rooms[name] = self.attributes.get(name)
+        return room
+
+    def _build_shared_rooms(self):
         """
-        # Create exit from `room_from` to `room_to`
-        exit_to = create_object(
-            typeclass="world.rooms.suexits.SUExit",
-            key=exit_to_name,
-            location=room_from,
-            destination=room_to,
-        )
-
-        # Create return exit from `room_to` to `room_from`
-        exit_from = create_object(
-            typeclass="world.rooms.suexits.SUExit",
-            key=exit_from_name,
-            location=room_to,
-            destination=room_from,
-        )
+        Sets up the shared rooms and connects them with exits.
+        """
+        # all rooms and exits are created in one transaction, so we only commit once
+        with transaction.atomic():
+            # Create the House or Home
+            house = create_object(
+                "world.rooms.rooms.SUHouse",
+                key=f"{self.key}'s House",
+                tags=["shared_room"],
+                attributes=[("desc", "This is your cozy home. It feels warm and welcoming.")],
+            )
+
+            # Create the Armoury
+            armoury = create_object(
+                "world.rooms.rooms.SUArmoury",
+                key=f"{self.key}'s Armoury",
+                tags=["shared_room"],
+                attributes=[("desc", "This is a secure room where you can store items and currency.")],
+            )
+
+            # Create the Rift
+            rift = create_object(
+                "world.rooms.rooms.SURift",
+                key=f"{self.key}'s Rift",
+                tags=["shared_room"],
+                attributes=[
+                    ("desc", "A mysterious room with portals leading to different parts of the world.")
+                ],
+            )
+
+            # store all three rooms on the account in one go
+            self.attributes.batch_add(("house", house), ("armoury", armoury), ("rift", rift))
+
+            # Connect the rooms with two-way exits
+            for room_from, room_to, exit_to_name, exit_from_name in (
+                (house, armoury, "Armoury", "House"),
+                (armoury, rift, "Rift", "Armoury"),
+                (rift, house, "House", "Rift"),
+            ):
+                create_object(_EXIT_TYPECLASS, key=exit_to_name, location=room_from, destination=room_to)
+                create_object(_EXIT_TYPECLASS, key=exit_from_name, location=room_to, destination=room_from)
+
+        # Notify the account
+        self.msg("Shared rooms have been created and connected for your account.")
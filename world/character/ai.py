@@ -33,8 +33,6 @@ mob.ai.run()
 
 """
 
-import random
-
 from evennia.utils.logger import log_trace
 from evennia.utils.utils import lazy_property
 
@@ -67,7 +65,12 @@ class AIHandler:
         Get a list of potential targets for the NPC to combat.
 
         """
-        return [obj for obj in self.obj.location.contents if hasattr(obj, "is_pc") and obj.is_pc]
+        # only characters can be PCs, so let the location skip items and exits for us
+        return [
+            obj
+            for obj in self.obj.location.contents_get(content_type="character")
+            if getattr(obj, "is_pc", False)
+        ]
 
 
     def get_traversable_exits(self, exclude_destination=None):
@@ -94,20 +97,7 @@ class AIHandler:
                 value is the probability of that action.
 
         """
-        # sort probabilities from higheest to lowest, making sure to normalize them 0..1
-        prob_total = sum(probabilities.values())
-        sorted_probs = sorted(
-            ((key, prob / prob_total) for key, prob in probabilities.items()),
-            key=lambda x: x[1],
-            reverse=True,
-        )
-
-        rand = random.random()
-        total = 0
-        for key, prob in sorted_probs:
-            total += prob
-            if rand <= total:
-                return key
+        return random_probability(probabilities)
 
 
     def run(self):
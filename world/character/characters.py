@@ -2,17 +2,135 @@
 Character class.
 
 """
+from bisect import bisect_left
+from collections.abc import Set as AbstractSet
+from functools import cached_property, lru_cache
+
 from evennia.objects.objects import DefaultCharacter
 from evennia.typeclasses.attributes import AttributeProperty
-from evennia.utils.logger import log_trace
+from evennia.utils.logger import log_warn
+from evennia.utils.search import search_script
 from evennia.utils.utils import lazy_property
 from evennia.objects.models import ObjectDB
+from evennia.typeclasses.tags import PermissionHandler
 
 from world.utils.rules import dice
-from world.character.equipment import EquipmentError, EquipmentHandler
+from world.character.equipment import EquipmentHandler
 from world.rooms.quests import SUQuestHandler
 from evennia.contrib.rpg.health_bar import display_meter
 
+# dungeons every new character starts out having access to
+_START_COMPLETED_DUNGEONS = ("main_dungeon",)
+
+# the abilities that can be raised on level-up
+_VALID_ABILITIES = frozenset(
+    ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")
+)
+
+# messages for being healed by yourself, by someone else, or by no-one in particular
+_HEAL_SELF = "|gYou heal yourself for {healed} health.|n"
+_HEAL_OTHER = "|g{healer} heals you for {healed} health.|n"
+_HEAL_ANON = "You are healed for {healed} health."
+
+# messages sent on every kill: the looter's share, the xp gained and a level-up
+_LOOT_MSG = "You loot {looted} for {loot} coins."
+_XP_MSG = "You gain {xp} XP."
+_LEVEL_UP_MSG = "|yCongratulations! You have leveled up to Level {level}!|n"
+
+# room messages for dying and for being beaten where death is not allowed. These are
+# parsed per receiver by msg_contents, since `$You()` reads differently to each of them
+_DEATH_MSG = "|r$You() $conj(collapse) in a heap.\nDeath embraces $You() ...|n"
+_BEATEN_MSG = "$You() $conj(collapse) in a heap, alive but beaten."
+
+# upper bound (in percent of max hp) of each hurt level, and its description
+_HURT_THRESHOLDS = (0, 15, 30, 45, 60, 80, 95)
+_HURT_LABELS = (
+    "|RCollapsed!|n",
+    "|rBarely hanging on|n",
+    "|rBadly wounded|n",
+    "|yWounded|n",
+    "|yHurt|n",
+    "|GBruised|n",
+    "|gScraped|n",
+    "|gPerfect|n",
+)
+# the hurt level for every whole percent 0-100, so a lookup is just an index
+_HURT_LUT = tuple(
+    _HURT_LABELS[bisect_left(_HURT_THRESHOLDS, percent)] for percent in range(101)
+)
+
+@lru_cache(maxsize=512)
+def _cached_meter(hp, hp_max):
+    """
+    The health meter for the prompt. Only a handful of hp values come up over and
+    over, so we keep the rendered meters around.
+
+    """
+    return display_meter(hp, hp_max)
+
+# resolved on first use, since the combat module imports this one
+_GET_OR_CREATE_COMBATHANDLER = None
+
+def _get_or_create_combathandler():
+    """
+    Get the twitch-combat `get_or_create_combathandler`, importing it only once.
+
+    """
+    global _GET_OR_CREATE_COMBATHANDLER
+    if _GET_OR_CREATE_COMBATHANDLER is None:
+        from world.combat.multi_party_combat_twitch import _BaseTwitchCombatCommand
+
+        _GET_OR_CREATE_COMBATHANDLER = _BaseTwitchCombatCommand.get_or_create_combathandler
+    return _GET_OR_CREATE_COMBATHANDLER
+
+# resolved on first use, since the npc module imports this one
+_SUMOB = None
+
+def _get_sumob():
+    """
+    Get the SUMob class, importing it only once.
+
+    """
+    global _SUMOB
+    if _SUMOB is None:
+        from world.character.npc import SUMob
+
+        _SUMOB = SUMob
+    return _SUMOB
+
+# the global DungeonManager script, looked up on first use
+_DUNGEON_MANAGER = None
+
+def _get_dungeon_manager():
+    """
+    Get the DungeonManager script, only searching for it the first time (or again if it
+    has since been deleted).
+
+    """
+    global _DUNGEON_MANAGER
+    if _DUNGEON_MANAGER is None or not _DUNGEON_MANAGER.pk:
+        _DUNGEON_MANAGER = search_script("dungeon_manager").first()
+    return _DUNGEON_MANAGER
+
+class SUPermissionHandler(PermissionHandler):
+    """
+    Permission handler that drops the character's cached permission string
+    (`ndb.perm_str`) whenever the permissions change.
+
+    """
+
+    def add(self, *args, **kwargs):
+        self.obj.ndb.perm_str = None
+        return super().add(*args, **kwargs)
+
+    def remove(self, *args, **kwargs):
+        self.obj.ndb.perm_str = None
+        return super().remove(*args, **kwargs)
+
+    def clear(self, *args, **kwargs):
+        self.obj.ndb.perm_str = None
+        return super().clear(*args, **kwargs)
+
 class LivingMixin:
 
     # makes it easy for mobs to know to attack PCs
@@ -23,48 +141,41 @@ class LivingMixin:
         """
         String describing how hurt this character is.
         """
-        percent = max(0, min(100, 100 * (self.hp / self.hp_max)))
-        if 95 < percent <= 100:
-            return "|gPerfect|n"
-        elif 80 < percent <= 95:
-            return "|gScraped|n"
-        elif 60 < percent <= 80:
-            return "|GBruised|n"
-        elif 45 < percent <= 60:
-            return "|yHurt|n"
-        elif 30 < percent <= 45:
-            return "|yWounded|n"
-        elif 15 < percent <= 30:
-            return "|rBadly wounded|n"
-        elif 1 < percent <= 15:
-            return "|rBarely hanging on|n"
-        elif percent == 0:
-            return "|RCollapsed!|n"
+        hp, hp_max = self.hp, self.hp_max
+        if hp <= 0 or hp_max <= 0:
+            return _HURT_LUT[0]
+        # round the percent up, so e.g. 95.5% still counts as above 95%
+        return _HURT_LUT[min(100, int(-(-100 * hp // hp_max)))]
 
     def heal(self, hp, healer=None): 
         """ 
-        Heal hp amount of health, not allowing to exceed our max hp     
+        Heal hp amount of health, not allowing to exceed our max hp
+
+        Returns:
+            int: The amount actually healed.
         """ 
-        damage = self.hp_max - self.hp 
-        healed = min(damage, hp) 
-        self.hp += healed 
-        
+        current_hp = self.hp
+        healed = min(self.hp_max - current_hp, hp)
+        if healed <= 0:
+            # already at full health, nothing to tell
+            return 0
+        self.hp = current_hp + healed
+
         if healer is self:
-            self.msg(f"|gYou heal yourself for {healed} health.|n")
+            self.msg(_HEAL_SELF.format(healed=healed))
         elif healer:
-            self.msg(f"|g{healer.key} heals you for {healed} health.|n")
+            self.msg(_HEAL_OTHER.format(healer=healer.key, healed=healed))
         else:
-            self.msg(f"You are healed for {healed} health.")
+            self.msg(_HEAL_ANON.format(healed=healed))
+        return healed
         
     def at_attacked(self, attacker, **kwargs):
         """
         Called when being attacked / combat starts.
         """
-        from world.combat.multi_party_combat_twitch import _BaseTwitchCombatCommand as Twitch
-        
         target = attacker
         # Get or create a shared combat handler for this combat
-        combathandler = Twitch.get_or_create_combathandler(self, target=target)
+        combathandler = _get_or_create_combathandler()(self, target=target)
         
         # Add the caller (the player or NPC initiating combat) and the target to the combat handler
         combathandler.add_combatant(self)
@@ -79,8 +190,14 @@ class LivingMixin:
         """
         Called when attacked and taking damage.
 
+        Returns:
+            int: The hp left after the damage.
+
         """
-        self.hp -= damage
+        hp = self.hp - damage
+        if damage:
+            self.hp = hp
+        return hp
 
     def at_defeat(self):
         """
@@ -95,23 +212,25 @@ class LivingMixin:
         Called when this living thing dies.
 
         """
-        self.location.msg_contents(
-            "|r$You() $conj(collapse) in a heap.\nDeath embraces $You() ...|n",
-            from_obj=self,
-        )
+        self.location.msg_contents(_DEATH_MSG, from_obj=self)
 
     def at_pay(self, amount):
         """When paying coins, make sure to never detract more than we have"""
-        amount = min(amount, self.coins)
-        self.coins -= amount
+        coins = self.coins
+        if coins <= 0 or amount <= 0:
+            # nothing to pay, so don't touch the coins
+            return 0
+        amount = min(amount, coins)
+        self.coins = coins - amount
         return amount
         
     def at_looted(self, looter):
         """Called when looted by another entity""" 
         # default to stealing some coins 
         loot = self.coins
-        looter.coins += loot
-        looter.msg(f"You loot {self.key} for {loot} coins.")
+        if loot:
+            looter.coins += loot
+        looter.msg(_LOOT_MSG.format(looted=self.key, loot=loot))
 
     def pre_loot(self, defeated_enemy):
         """
@@ -149,12 +268,19 @@ class LivingMixin:
             defeated_enemy (Object): The enemy just looted.
 
         """
-        from world.character.npc import SUMob
-
-        if hasattr(self, "is_pc") and self.is_pc:
-            if SUCharacter.add_xp(self, int(SUMob.get_xp_value(defeated_enemy))):
+        if self.is_pc:
+            if SUCharacter.add_xp(self, int(_get_sumob().get_xp_value(defeated_enemy))):
                 self.level_up("strength", "dexterity", "intelligence")
 
+    def update_stats(self, force=True):
+        """
+        Update the stats display of the character. Only PCs have a prompt, so this
+        does nothing by default.
+
+        Args:
+            force (bool, optional): Redraw the display even if nothing changed.
+        """
+
 class SUCharacter(LivingMixin, DefaultCharacter):
     """
     The Character just re-implements some of the Object's methods and hooks
@@ -183,23 +309,44 @@ class SUCharacter(LivingMixin, DefaultCharacter):
     xp = AttributeProperty(default=0)
     xp_per_level = 1000
 
-    @lazy_property
+    @property
     def completed_dungeons(self):
         """
-        Get a list of completed dungeons.
+        Get the set of completed dungeons. Add to it with `.add()`; it is saved as it changes.
+        Characters from before this was a set have a list stored, which is converted here
+        the first time.
         """
-        return self.db.completed_dungeons or []
+        completed = self.db.completed_dungeons
+        if not isinstance(completed, AbstractSet):
+            self.db.completed_dungeons = set(completed or ())
+            completed = self.db.completed_dungeons
+        return completed
 
-    @lazy_property 
+    # cached_property rather than lazy_property: after the first access this is
+    # a plain instance-dict hit instead of a call through a data descriptor
+    @cached_property
     def equipment(self):
         """Allows to access equipment like char.equipment.worn"""
         return EquipmentHandler(self)
     
-    @lazy_property
+    @cached_property
     def quests(self):
         """Access and track quests"""
         return SUQuestHandler(self)
 
+    @lazy_property
+    def permissions(self):
+        """Permissions, tracking changes so `perm_str` can be cached"""
+        return SUPermissionHandler(self)
+
+    @property
+    def perm_str(self):
+        """The permissions as a display string, cached until they change."""
+        perm_str = self.ndb.perm_str
+        if perm_str is None:
+            perm_str = self.ndb.perm_str = str(self.permissions)
+        return perm_str
+
     @property
     def weapon(self):
         return self.equipment.weapon
@@ -214,21 +361,21 @@ class SUCharacter(LivingMixin, DefaultCharacter):
 
         """
         super().at_object_creation()
-        self.db.party = None  # Reference to the party this character belongs to
-        self.db.completed_dungeons = ["main_dungeon"]  # List of completed dungeons
+        self.attributes.batch_add(
+            ("party", None),  # Reference to the party this character belongs to
+            ("completed_dungeons", set(_START_COMPLETED_DUNGEONS)),  # Set of completed dungeons
+        )
 
     def at_pre_puppet(self, account, session=None):
         """
         Use this to set up their home room.
         """
-        if not account.db.house:
-            account.at_account_creation()
-
-        # Get the account's shared rooms
-        if not account.db.house == self.home:
-                self.home = account.db.house  # Set the home to the account's house
-                self.db.armoury = account.db.armoury  # Link to the Armory
-                self.db.rift = account.db.rift  # Link to the Rift
+        # Get the account's shared rooms (these are created on first access)
+        house = account.house
+        if not house == self.home:
+                self.home = house  # Set the home to the account's house
+                self.db.armoury = account.armoury  # Link to the Armory
+                self.db.rift = account.rift  # Link to the Rift
 
         # Move the character to their home at every login
         self.location = self.home
@@ -246,7 +393,6 @@ class SUCharacter(LivingMixin, DefaultCharacter):
             return  # Not in a party, nothing to do
 
         # Access the PartyManager
-        from evennia import search_script
         party_manager = search_script("party_manager").first()
         if not party_manager:
             return  # PartyManager not available, can't handle disconnection
@@ -259,39 +405,26 @@ class SUCharacter(LivingMixin, DefaultCharacter):
 
         # Remove the character from the party
         self.db.party = None  # Clear party reference for the disconnected member
-
-        if party["leader_id"] == self.id and len(party["member_ids"]) > 1:
-            # If the leader is leaving and there are remaining members
-            remaining_members = [member for member in party["member_ids"] if member != self.id]
-            new_leader_id = remaining_members[0]  # Set the first member as the new leader
-            new_leader = ObjectDB.objects.get(id=new_leader_id)  # Retrieve the new leader object
-            party["leader_id"] = new_leader.id
-            new_leader.msg(f"|yYou are now the leader of the party '{party['name']}'.|n")
-        else:
-            # If the character is not the leader, just remove them from the party
-            if party_manager.remove_member_from_party(self, party_name):
-                self.msg(f"You have left the party '{party_name}'.")
-                remaining_members = party_manager.get_party_members(party_name)
-
-        """Remove a character from the PartyManager's list of members."""
-        if self.id in party["member_ids"]:
-            party["member_ids"].remove(self.id)
+        was_leader = party["leader_id"] == self.id
+        if party_manager.remove_member_from_party(self, party_name):
             self.msg(f"You have left the party '{party_name}'.")
-        
+
         # Notify remaining party members
-        remaining_members = party_manager.get_party_members(party_name)
-        for member in remaining_members:
-            member.msg(f"|y{self.key} has left the party '{party_name}' due to disconnection.|n")
+        remaining_members = party_manager.broadcast(
+            party_name, f"|y{self.key} has left the party '{party_name}' due to disconnection.|n"
+        )
 
         # Disband the party if no members remain
         if not remaining_members:
             party_manager.remove_party(party_name)
             self.msg(f"The party '{party_name}' has been disbanded.")
+            return
 
-       # Reassign leadership if the disconnecting member was the leader
-        if party["leader_id"] == self.id:
+        # Reassign leadership if the disconnecting member was the leader
+        if was_leader:
             new_leader = remaining_members[0]
-            party["leader_id"] = new_leader.id
+            # re-fetch, since removing the member stored a fresh copy of the party
+            party_manager.get_party(party_name)["leader_id"] = new_leader.id
             new_leader.msg(f"|yYou are now the leader of the party '{party_name}'.|n")
 
     def at_pre_move(self, destination, **kwargs):
@@ -347,10 +480,8 @@ class SUCharacter(LivingMixin, DefaultCharacter):
             **kwargs: Passed from move operation; unused here.
 
         """
-        try:
-            self.equipment.add(moved_object)
-        except EquipmentError as err:
-            log_trace(f"at_object_receive error: {err}")
+        if not self.equipment.try_add(moved_object):
+            log_warn(f"at_object_receive: {moved_object.key} doesn't fit in {self.key}'s equipment.")
 
     def at_pre_object_leave(self, leaving_object, destination, **kwargs):
         """
@@ -378,14 +509,14 @@ class SUCharacter(LivingMixin, DefaultCharacter):
         This happens when character drops <= 0 HP.
 
         """
-        if self.location.allow_death:
+        location = self.location
+        if location.allow_death:
             # this allow rooms to have non-lethal battles
             self.at_death()
         else:
-            self.location.msg_contents(
-                "$You() $conj(collapse) in a heap, alive but beaten.",
-                from_obj=self)
-            self.heal(self.hp_max)
+            location.msg_contents(_BEATEN_MSG, from_obj=self)
+            # back to full health, without the heal message
+            self.hp = self.hp_max
     
     def at_death(self):
         """
@@ -423,10 +554,14 @@ class SUCharacter(LivingMixin, DefaultCharacter):
             level 2 -> 3 = 2000 XP etc
 
         """
-        self.xp += xp
-        next_level_xp = self.level * self.xp_per_level
-        self.msg(f"You gain {xp} XP.")
-        return self.xp >= next_level_xp
+        new_xp = self.xp + xp
+        self.xp = new_xp
+        self.msg(_XP_MSG.format(xp=xp))
+        # the threshold only changes on level-up, so keep it around until then
+        next_level_xp = self.ndb.next_level_xp
+        if next_level_xp is None:
+            next_level_xp = self.ndb.next_level_xp = self.level * self.xp_per_level
+        return new_xp >= next_level_xp
 
     def level_up(self, *abilities):
         """
@@ -441,64 +576,83 @@ class SUCharacter(LivingMixin, DefaultCharacter):
 
         """
 
-        self.level += 1
-        for ability in set(abilities[:3]):
+        level = self.level + 1
+        # work out all the new values first, then store them in one go
+        changes = [("level", level)]
+        raised = []
+        for ability in abilities[:3]:
             # limit to max amount allowed, each one unique
-            try:
-                # set at most to the max bonus
-                current_bonus = getattr(self, ability)
-                setattr(
-                    self,
-                    ability,
-                    min(10, current_bonus + 1),
-                )
-            except AttributeError:
-                pass
-
-        # update hp
-        self.hp_max = max(self.hp_max + 1, dice.roll(f"{self.level}d8"))
-        self.msg(f"|yCongratulations! You have leveled up to Level {self.level}!|n")
-
-    def update_prompt(self):
+            if ability in raised or ability not in _VALID_ABILITIES:
+                continue
+            raised.append(ability)
+            # set at most to the max bonus
+            changes.append((ability, min(10, getattr(self, ability) + 1)))
+
+        # update hp - at least +1, and no need to roll if the dice can't beat that
+        hp_max = self.hp_max + 1
+        if hp_max < level * 8:
+            hp_max = max(hp_max, dice.roll_nd(level, 8))
+        changes.append(("hp_max", hp_max))
+        self.attributes.batch_add(*changes)
+        self.ndb.next_level_xp = level * self.xp_per_level
+        self.msg(_LEVEL_UP_MSG.format(level=level))
+
+    def update_prompt(self, force=True):
         """
         Updates the prompt displayed to the player.
+
+        Args:
+            force (bool, optional): Send the prompt even if hp hasn't changed since it was
+                last sent. This is needed after command output, so the prompt is redrawn
+                below it.
         """
         if not self.prompt_on:
             return
-        prompt_text = display_meter(self.hp,self.hp_max)
-        self.msg(prompt=prompt_text)
+        hp, hp_max = self.hp, self.hp_max
+        if not force and self.ndb.prompt_hp == (hp, hp_max):
+            return
+        self.ndb.prompt_hp = (hp, hp_max)
+        self.msg(prompt=_cached_meter(hp, hp_max))
 
-    def update_stats(self):
+    def update_stats(self, force=True):
         """
         Update the stats of the character.
+
+        Args:
+            force (bool, optional): Re-send the prompt even if it hasn't changed. Periodic
+                updates (combat and resting ticks) pass `False`, so an unchanged prompt
+                isn't sent again every tick.
         """
-        if hasattr(self, "is_pc") and self.is_pc:
-            self.update_prompt()
+        self.update_prompt(force=force)
 
     def get_available_dungeon_templates(self, completed_dungeons):
         """
         Get a list of dungeon templates available to the character.
 
         Args:
-            completed_dungeons (list): A list of completed dungeon template identifiers.
+            completed_dungeons (set): The completed dungeon template identifiers.
 
         Returns:
             list: A list of available dungeon templates.
         """
-        dungeon_manager = self.search("dungeon_manager", global_search=True)
+        dungeon_manager = _get_dungeon_manager()
 
         if not dungeon_manager:
             return []
 
-        templates = dungeon_manager.get_templates()
-        available_templates = [template for template in templates if template.get("id") not in completed_dungeons]
-        return available_templates
+        # the templates are listed by key
+        return [
+            template for template in dungeon_manager.get_templates()
+            if template not in completed_dungeons
+        ]
     
 class Party:
     """
     Represents a party of characters.
     """
 
+    __slots__ = ("leader_id", "name", "member_ids")
+
     def __init__(self, leader, name):
         self.leader_id = leader.id  # Store the leader's object ID
         self.name = name  # The name of the party
@@ -535,7 +689,7 @@ class Party:
         Returns:
             list: A list of Character objects in the party.
         """
-        return [char for char in self._resolve_ids(self.member_ids)]
+        return self._resolve_ids(self.member_ids)
 
     def _resolve_ids(self, id_set):
         """
@@ -547,7 +701,7 @@ class Party:
         Returns:
             list: The resolved objects.
         """
-        return [obj for obj in ObjectDB.objects.filter(id__in=id_set)]
+        return list(ObjectDB.objects.in_bulk(id_set).values())
 
     def disband(self):
         """
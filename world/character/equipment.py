@@ -1,8 +1,19 @@
+from types import MappingProxyType
+
 from evennia.utils.utils import inherits_from
 
 from world.utils.enums import Ability, WieldLocation
 from world.objects.object import SUObject, get_bare_hands
 
+# what every slot holds when nothing is in it
+_EMPTY_SLOTS = MappingProxyType({
+    WieldLocation.WEAPON_HAND: None,
+    WieldLocation.SHIELD_HAND: None,
+    WieldLocation.TWO_HANDS: None,
+    WieldLocation.BODY: None,
+    WieldLocation.HEAD: None,
+})
+
 class EquipmentError(TypeError):
     pass
 
@@ -17,46 +28,45 @@ class EquipmentHandler:
         
     def _load(self):
         """
-        Load or create a new slot storage.
+        Load or create a new slot storage. Only filled slots are stored, so we
+        start from all-empty slots and fill in what was saved.
 
         """
-        self.slots = self.obj.attributes.get(
-            self.save_attribute,
-            category="inventory",
-            default={
-                WieldLocation.WEAPON_HAND: None, 
-                WieldLocation.SHIELD_HAND: None, 
-                WieldLocation.TWO_HANDS: None, 
-                WieldLocation.BODY: None,
-                WieldLocation.HEAD: None,
-                WieldLocation.BACKPACK: []
-            } 
-        )
+        stored = self.obj.attributes.get(self.save_attribute, category="inventory", default={})
+        self.slots = {**_EMPTY_SLOTS, **stored}
         self.slots[WieldLocation.BACKPACK] = [
-            obj for obj in self.slots[WieldLocation.BACKPACK] if obj and obj.id
+            obj for obj in self.slots.get(WieldLocation.BACKPACK, ()) if obj and obj.id
         ]
     
     def _save(self):
         """
-        Save slot to storage.
+        Save slot to storage. Empty slots are left out, they are filled back in on load.
 
         """
-        self.obj.attributes.add(self.save_attribute, self.slots, category="inventory")
+        self.obj.attributes.add(
+            self.save_attribute,
+            {slot: slotobj for slot, slotobj in self.slots.items() if slotobj},
+            category="inventory",
+        )
     
     def count_slots(self):
         """
         Count slot usage. This is fetched from the .size Attribute of the
-        object. The size can also be partial slots.
+        object. The size can also be partial slots. This is counted fresh every
+        time, since items can be deleted or resized without going through the
+        handler; objects deleted since they were stored don't count.
 
         """
         slots = self.slots
         wield_usage = sum(
             getattr(slotobj, "size", 0) or 0
             for slot, slotobj in slots.items()
-            if slot is not WieldLocation.BACKPACK
+            if slot is not WieldLocation.BACKPACK and slotobj and slotobj.id
         )
         backpack_usage = sum(
-            getattr(slotobj, "size", 0) or 0 for slotobj in slots[WieldLocation.BACKPACK]
+            getattr(slotobj, "size", 0) or 0
+            for slotobj in slots[WieldLocation.BACKPACK]
+            if slotobj.id
         )
         return wield_usage + backpack_usage
 
@@ -70,16 +80,19 @@ class EquipmentHandler:
         """
         return getattr(self.obj, Ability.CON.value, 1) + 10
     
-    def validate_slot_usage(self, obj):
+    def _get_slot_error(self, obj):
         """
         Check if obj can fit in equipment, based on its size.
 
         Args:
             obj (SUObject): The object to add.
 
+        Returns:
+            str or None: Why obj doesn't fit, or None if it does.
+
         """
         if not inherits_from(obj, SUObject):
-            raise EquipmentError(f"{obj.key} is not something that can be equipped.")
+            return f"{obj.key} is not something that can be equipped."
 
         size = obj.size
         max_slots = self.max_slots
@@ -87,11 +100,26 @@ class EquipmentHandler:
 
         if current_slot_usage + size > max_slots:
             slots_left = max_slots - current_slot_usage
-            raise EquipmentError(
+            return (
                 f"Equipment full ($int2str({slots_left}) slots "
                 f"remaining, {obj.key} needs $int2str({size}) "
                 f"$pluralize(slot, {size}))."
             )
+
+    def validate_slot_usage(self, obj):
+        """
+        Check if obj can fit in equipment, based on its size.
+
+        Args:
+            obj (SUObject): The object to add.
+
+        Raises:
+            EquipmentError: If obj doesn't fit.
+
+        """
+        error = self._get_slot_error(obj)
+        if error:
+            raise EquipmentError(error)
         return True
 
     def get_current_slot(self, obj):
@@ -285,6 +313,24 @@ class EquipmentHandler:
         self.slots[WieldLocation.BACKPACK].append(obj)
         self._save()
 
+    def try_add(self, obj):
+        """
+        Like `add`, but for when not having room is an expected outcome rather than
+        an error.
+
+        Args:
+            obj (SUObject): The object to add.
+
+        Returns:
+            bool: If the object was added or not.
+
+        """
+        if self._get_slot_error(obj):
+            return False
+        self.slots[WieldLocation.BACKPACK].append(obj)
+        self._save()
+        return True
+
     def remove(self, obj_or_slot):
         """
         Remove specific object or objects from a slot.
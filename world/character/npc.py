@@ -7,7 +7,7 @@ from evennia.utils.evmenu import EvMenu
 from evennia.utils.utils import lazy_property, make_iter
 
 from world.character.ai import AIHandler
-from world.character.characters import LivingMixin, SUCharacter
+from world.character.characters import LivingMixin, SUCharacter, _get_or_create_combathandler
 from world.utils.enums import Ability, WieldLocation
 from world.objects.object import get_bare_hands
 from world.utils.rules import dice
@@ -57,29 +57,11 @@ class SUNPC(LivingMixin, DefaultCharacter):
     # pulled into combat.
     group = TagProperty("npcs")
 
-    @property
-    def strength(self):
+    def _get_ability(self):
+        # in Knave, every ability bonus of an NPC is its hit dice
         return self.hit_dice
 
-    @property
-    def dexterity(self):
-        return self.hit_dice
-
-    @property
-    def constitution(self):
-        return self.hit_dice
-
-    @property
-    def intelligence(self):
-        return self.hit_dice
-
-    @property
-    def wisdom(self):
-        return self.hit_dice
-
-    @property
-    def charisma(self):
-        return self.hit_dice
+    strength = dexterity = constitution = intelligence = wisdom = charisma = property(_get_ability)
 
     #@property
     #def hp_max(self):
@@ -91,7 +73,9 @@ class SUNPC(LivingMixin, DefaultCharacter):
 
         """
         self.hp = self.hp_max
-        self.tags.add("npcs", category="group")
+        # the `group` TagProperty usually added this already
+        if not self.tags.has("npcs", category="group"):
+            self.tags.add("npcs", category="group")
         self.ndb.combathandler = None
 
     def at_attacked(self, attacker, **kwargs):
@@ -199,19 +183,23 @@ def node_start(caller, raw_string, **kwargs):
     # we presume a back-reference to the npc this is added when the menu is created
     npc = kwargs["npc"]
 
-    # grab a (possibly random) welcome text
-    text = choice(make_iter(npc.hi_text))
-
-    # determine options based on `node_start_*` nodes available
-    toplevel_node_keys = [
-        node_key for node_key in caller.ndb._evmenu._menutree if node_key.startswith("node_start_")
-    ]
-    options = []
-    for node_key in toplevel_node_keys:
-        option_name = node_key[11:].replace("_", " ").capitalized()
+    # grab a (possibly random) welcome text; it's usually just a string
+    hi_text = npc.hi_text
+    text = hi_text if isinstance(hi_text, str) else choice(make_iter(hi_text))
+
+    # determine options based on `node_start_*` nodes available. The menu tree doesn't
+    # change while the menu is open, so only work out the option names the first time
+    menu = caller.ndb._evmenu
+    start_options = getattr(menu, "_start_options", None)
+    if start_options is None:
+        start_options = menu._start_options = tuple(
+            (node_key[11:].replace("_", " ").capitalize(), node_key)
+            for node_key in menu._menutree
+            if node_key.startswith("node_start_")
+        )
 
-        # we let the menu number the choices, so we don't use key here
-        options.append({"desc": option_name, "goto": node_key})
+    # we let the menu number the choices, so we don't use key here
+    options = [{"desc": option_name, "goto": node_key} for option_name, node_key in start_options]
 
     return text, options
 
@@ -277,11 +265,9 @@ class SUMob(SUNPC):
         """
         #print(f"'{self.key}' called at_attacked")
 
-        from world.combat.multi_party_combat_twitch import _BaseTwitchCombatCommand as Twitch
-        
         target = attacker
         # Get or create a shared combat handler for this combat
-        combathandler = Twitch.get_or_create_combathandler(self, target=target)
+        combathandler = _get_or_create_combathandler()(self, target=target)
         
         # Add the caller (the player or NPC initiating combat) and the target to the combat handler
         combathandler.add_combatant(self)
@@ -384,10 +370,3 @@ class SUMob(SUNPC):
         base_xp = getattr(self, "xp_value", 0)  # Base XP defined on the mob
         level_multiplier = getattr(self, "level", 1)  # Use the entity's level if it exists
         return base_xp * level_multiplier
-    
-    def at_defeat(self):
-        """
-        Mobs die right away when defeated, no death-table rolls.
-
-        """
-        self.at_death()
\ No newline at end of file
@@ -15,6 +15,8 @@ This establishes the basic building blocks for combat:
 
 """
 
+import re
+
 from evennia.scripts.scripts import DefaultScript
 from evennia.typeclasses.attributes import AttributeProperty
 from evennia.utils import evtable
@@ -22,6 +24,9 @@ from evennia.utils.create import create_script
 
 from world.utils.rules import dice
 
+# matches `$You(key)`/`$you(key)` references to other objects, but not a bare `$You()`
+_RE_OTHER_YOU = re.compile(r"\$[yY]ou\((?!\))")
+
 class CombatFailure(RuntimeError):
     """
     Some failure during combat actions.
@@ -35,29 +40,28 @@ class CombatAction:
     This represents the executable code to run to perform an action. It is initialized from an
     'action-dict', a set of properties stored in the action queue by each combatant.
 
+    Actions are created for every action executed, so they use `__slots__`. Each child
+    class lists the action-dict keys it uses and stores them in its own `__init__`.
+
     """
 
+    __slots__ = ("combathandler", "combatant")
+
     def __init__(self, combathandler, combatant, action_dict):
         """
-        Each key-value pair in the action-dict is stored as a property on this class
-        for later access.
+        Child classes extend this to store the action-dict keys they need as properties
+        on the action for later access (like `action.target`). Other keys (like `dt`) are
+        only used by the combathandler and are not stored.
 
         Args:
             combatant (SUCharacter, SUNPC): The combatant performing
                 the action.
-            action_dict (dict): A dict containing all properties to initialize on this
-                class. This should not be any keys with `_` prefix, since these are
-                used internally by the class.
+            action_dict (dict): A dict containing all properties of this action.
 
         """
         self.combathandler = combathandler
         self.combatant = combatant
 
-        # store the action dicts' keys as properties accessible as e.g. action.target etc
-        for key, val in action_dict.items():
-            if not key.startswith("_"):
-                setattr(self, key, val)
-
     def msg(self, message, broadcast=True):
         """
         Convenience route to the combathandler msg-sender mechanism.
@@ -103,6 +107,8 @@ class CombatActionHold(CombatAction):
             }
     """
 
+    __slots__ = ()
+
 class CombatActionAttack(CombatAction):
     """
     A regular attack, using a wielded weapon.
@@ -113,6 +119,12 @@ class CombatActionAttack(CombatAction):
             }
     """
 
+    __slots__ = ("target",)
+
+    def __init__(self, combathandler, combatant, action_dict):
+        super().__init__(combathandler, combatant, action_dict)
+        self.target = action_dict["target"]
+
     def execute(self):
         attacker = self.combatant
         weapon = attacker.weapon
@@ -145,6 +157,16 @@ class CombatActionStunt(CombatAction):
 
     """
 
+    __slots__ = ("recipient", "target", "advantage", "stunt_type", "defense_type")
+
+    def __init__(self, combathandler, combatant, action_dict):
+        super().__init__(combathandler, combatant, action_dict)
+        self.recipient = action_dict["recipient"]
+        self.target = action_dict["target"]
+        self.advantage = action_dict["advantage"]
+        self.stunt_type = action_dict["stunt_type"]
+        self.defense_type = action_dict["defense_type"]
+
     def execute(self):
         combathandler = self.combathandler
         attacker = self.combatant
@@ -205,6 +227,13 @@ class CombatActionUseItem(CombatAction):
             }
     """
 
+    __slots__ = ("item", "target")
+
+    def __init__(self, combathandler, combatant, action_dict):
+        super().__init__(combathandler, combatant, action_dict)
+        self.item = action_dict["item"]
+        self.target = action_dict.get("target")
+
     def execute(self):
         item = self.item
         user = self.combatant
@@ -230,6 +259,12 @@ class CombatActionWield(CombatAction):
             }
     """
 
+    __slots__ = ("item",)
+
+    def __init__(self, combathandler, combatant, action_dict):
+        super().__init__(combathandler, combatant, action_dict)
+        self.item = action_dict["item"]
+
     def execute(self):
         self.combatant.equipment.move(self.item)
         self.msg(f"$You() $conj(wield) $You({self.item.key}).")
@@ -276,10 +311,11 @@ class SUCombatBaseHandler(DefaultScript):
 
         combathandler_key = kwargs.pop("key", "combathandler")
 
-        # Check if `obj` already has a combat handler
+        # Check if `obj` already has a combat handler. This is only cached in ndb, so make
+        # sure the script wasn't deleted (it has no id then) since it was stored
         combathandler = obj.ndb.combathandler
                 
-        if combathandler:
+        if combathandler and combathandler.id:
             if target:
                 # Ensure target is added to the same handler
                 #print(f"Handler already exists for {obj}. Merging with handler for {target}.")
@@ -302,7 +338,7 @@ class SUCombatBaseHandler(DefaultScript):
             
             target_combathandler = target.ndb.combathandler
             
-            if target_combathandler:
+            if target_combathandler and target_combathandler.id:
                 #print(target_combathandler, "handler already exists for", target)
                 obj.ndb.combathandler = target_combathandler
                 #print(obj, "merging with handler for", target)
@@ -362,11 +398,16 @@ class SUCombatBaseHandler(DefaultScript):
         if not broadcast and combatant:
             exclude = [obj for obj in location_objs if obj is not combatant]
 
+        # the key->object mapping is only needed to resolve `$You(key)` references
+        mapping = None
+        if _RE_OTHER_YOU.search(message):
+            mapping = {locobj.key: locobj for locobj in location_objs}
+
         location.msg_contents(
             message,
             exclude=exclude,
             from_obj=combatant,
-            mapping={locobj.key: locobj for locobj in location_objs},
+            mapping=mapping,
         )
 
     def get_combat_summary(self, combatant):
@@ -378,7 +419,7 @@ class SUCombatBaseHandler(DefaultScript):
             combatant (SUCharacter, SUNPC): The combatant to get.
 
         Returns:
-            EvTable: A table representing the current state of combat.
+            str: The rendered table representing the current state of combat.
 
         Example:
         ::
@@ -397,16 +438,23 @@ class SUCombatBaseHandler(DefaultScript):
         allies = [f"{ally} ({ally.hurt_level})" for ally in allies]
         enemies = [f"{enemy} ({enemy.hurt_level})" for enemy in enemies]
 
+        # the table only changes when someone joins, leaves or changes hurt level, so
+        # re-use the last render if none of the rows changed
+        summary_key = (tuple(allies), tuple(enemies))
+        cached = self.ndb.summary_cache
+        if cached and cached[0] == summary_key:
+            return cached[1]
+
         # the center column with the 'vs'
-        vs_column = ["" for _ in range(max(nallies, nenemies))]
+        vs_column = [""] * max(nallies, nenemies)
         vs_column[len(vs_column) // 2] = "|wvs|n"
 
         # the two allies / enemies columns should be centered vertically
         diff = abs(nallies - nenemies)
         top_empty = diff // 2
         bot_empty = diff - top_empty
-        topfill = ["" for _ in range(top_empty)]
-        botfill = ["" for _ in range(bot_empty)]
+        topfill = [""] * top_empty
+        botfill = [""] * bot_empty
 
         if nallies >= nenemies:
             enemies = topfill + enemies + botfill
@@ -414,15 +462,19 @@ class SUCombatBaseHandler(DefaultScript):
             allies = topfill + allies + botfill
 
         # make a table with three columns
-        return evtable.EvTable(
-            table=[
-                evtable.EvColumn(*allies, align="l"),
-                evtable.EvColumn(*vs_column, align="c"),
-                evtable.EvColumn(*enemies, align="r"),
-            ],
-            border=None,
-            maxwidth=78,
+        summary = str(
+            evtable.EvTable(
+                table=[
+                    evtable.EvColumn(*allies, align="l"),
+                    evtable.EvColumn(*vs_column, align="c"),
+                    evtable.EvColumn(*enemies, align="r"),
+                ],
+                border=None,
+                maxwidth=78,
+            )
         )
+        self.ndb.summary_cache = (summary_key, summary)
+        return summary
 
     def get_sides(self, combatant):
         """
@@ -11,7 +11,6 @@ from evennia import AttributeProperty, CmdSet, default_cmds
 from evennia.commands.command import Command, InterruptCommand
 from evennia.utils.utils import (
     display_len,
-    inherits_from,
     list_to_string,
     pad,
     repeat,
@@ -29,6 +28,9 @@ from world.combat.combat_base import (
 )
 from world.utils.enums import ABILITY_REVERSE_MAP
 
+# listed when an unknown stunt ability is given
+_ABILITY_NAMES = ", ".join(ABILITY_REVERSE_MAP)
+
 class SUCombatTwitchHandler(SUCombatBaseHandler):
     """
     This is created on the combatant when combat starts. It tracks only the combatants
@@ -95,12 +97,12 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
 
         """
         # get all entities involved in combat by looking up their combathandlers
+        location = self.obj.location
         combatants = [
             comb
-            for comb in self.obj.location.contents
+            for comb in location.contents
             if hasattr(comb, "scripts") and comb.scripts.has(self.key)
         ]
-        location = self.obj.location
 
         if hasattr(location, "allow_pvp") and location.allow_pvp:
             # in pvp, everyone else is an enemy
@@ -108,9 +110,10 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
             enemies = [comb for comb in combatants if comb != combatant]
         else:
             # otherwise, enemies/allies depend on who combatant is
-            pcs = [comb for comb in combatants if inherits_from(comb, SUCharacter)]
-            npcs = [comb for comb in combatants if comb not in pcs]
-            if combatant in pcs:
+            pcs, npcs = [], []
+            for comb in combatants:
+                (pcs if isinstance(comb, SUCharacter) else npcs).append(comb)
+            if isinstance(combatant, SUCharacter):
                 # combatant is a PC, so NPCs are all enemies
                 allies = pcs
                 enemies = npcs
@@ -185,16 +188,22 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
         self.action_dict = action_dict
         dt = action_dict.get("dt", 0)
 
+        if dt > 0 and self.current_ticker_ref and self.ndb.ticker_dt == dt:
+            # the current ticker already fires at this rate and will pick up the new
+            # action-dict, so there's no need to replace it
+            return
         if self.current_ticker_ref:
             # we already have a current ticker going - abort it
             unrepeat(self.current_ticker_ref)
         if dt <= 0:
             # no repeat
             self.current_ticker_ref = None
+            self.ndb.ticker_dt = None
         else:
             # always schedule the task to be repeating, cancel later otherwise. We store
             # the tickerhandler's ref to make sure we can remove it later
             self.current_ticker_ref = repeat(dt, self.execute_next_action, id_string="combat")
+            self.ndb.ticker_dt = dt
 
     def execute_next_action(self):
         """
@@ -289,11 +298,9 @@ class _BaseTwitchCombatCommand(Command):
         if not args:
             return
 
-        if " on " in args:
-            lhs, rhs = args.split(" on ", 1)
-        else:
-            lhs, *rhs = args.split(None, 1)
-            rhs = " ".join(rhs)
+        lhs, sep, rhs = args.partition(" on ")
+        if not sep:
+            lhs, _, rhs = args.partition(" ")
         self.lhs, self.rhs = lhs.strip(), rhs.strip()
 
     def get_or_create_combathandler(self, target=None, combathandler_key="combathandler"):
@@ -301,7 +308,7 @@ class _BaseTwitchCombatCommand(Command):
         Get or create the combathandler assigned to this combatant.
 
         """
-        if target:
+        if target and target != self.caller:
             # add/check combathandler to the target
             if target.hp_max is None:
                 self.msg("You can't attack that!")
@@ -404,22 +411,18 @@ class CmdStunt(_BaseTwitchCombatCommand):
 
         stunt_type, recipient, target = None, None, None
 
-        stunt_type, *args = args.split(None, 1)
-        if stunt_type:
-            stunt_type = stunt_type.strip().lower()
-
-        args = args[0] if args else ""
+        stunt_type, _, args = args.strip().partition(" ")
+        stunt_type = stunt_type.lower()
 
-        recipient, *args = args.split(None, 1)
-        target = args[0] if args else None
+        recipient, _, target = args.strip().partition(" ")
+        target = target.strip() or None
 
         # validate input and try to guess if not given
 
         # ability is requried
         if not stunt_type or stunt_type not in ABILITY_REVERSE_MAP:
             self.msg(
-                f"'{stunt_type}' is not a valid ability. Pick one of"
-                f" {', '.join(ABILITY_REVERSE_MAP.keys())}."
+                f"'{stunt_type}' is not a valid ability. Pick one of {_ABILITY_NAMES}."
             )
             raise InterruptCommand()
 
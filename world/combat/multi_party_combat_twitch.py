@@ -2,7 +2,6 @@ from evennia import AttributeProperty, CmdSet, default_cmds
 from evennia.commands.command import Command, InterruptCommand
 from evennia.utils.utils import (
     display_len,
-    inherits_from,
     list_to_string,
     pad,
     repeat,
@@ -10,6 +9,8 @@ from evennia.utils.utils import (
 )
 
 import time
+from bisect import insort
+from operator import itemgetter
 
 from world.character.characters import SUCharacter, LivingMixin
 from world.character.npc import SUMob
@@ -23,6 +24,16 @@ from world.combat.combat_base import (
 )
 from world.utils.enums import ABILITY_REVERSE_MAP
 
+# listed when an unknown stunt ability is given
+_ABILITY_NAMES = ", ".join(ABILITY_REVERSE_MAP)
+
+# sort key for the action queue
+_TIME_TO_ACT = itemgetter("time_to_act")
+
+# flags stored per (recipient id, target id) pair in the handler's `ndb.advantages`
+_ADVANTAGE = 1
+_DISADVANTAGE = 2
+
 class SUCombatTwitchHandler(SUCombatBaseHandler):
     """
     This handler manages a shared combat context for multi-party, Twitch-style combat.
@@ -37,8 +48,6 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
         "wield": CombatActionWield,
     }
     # dynamic properties
-    advantage_against = AttributeProperty(dict)
-    disadvantage_against = AttributeProperty(dict)
     action_dict = AttributeProperty(dict)
     fallback_action_dict = AttributeProperty({"key": "attack", "dt": 1, "repeat": False})
 
@@ -75,6 +84,9 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
 
     def at_init(self):
         self.obj.cmdset.add(TwitchLookCmdSet, persistent=False)
+        # the combat is shared, so dis/advantage is tracked per (recipient, target) pair.
+        # It only matters for the current fight, so it's not saved to the database
+        self.ndb.advantages = {}
 
     def display_combatants(self):
         """
@@ -100,6 +112,7 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
         #self.msg(f"add_combattant: {combatant}")
         if combatant not in self.db.combatants:
             self.db.combatants.append(combatant)
+            self.ndb.sides = None  # re-split the sides on next get_sides
             combatant.ndb.combathandler = self
             combatant.msg(f"You join combat!")
         # Display the current list of combatants
@@ -115,7 +128,8 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
 
         Returns:
             tuple: A tuple of lists `(allies, enemies)`, from the perspective of `combatant`.
-                Note that combatant itself is not included in either of these.
+                Note that combatant itself is not included in either of these. The lists
+                are shared between calls, so don't modify them.
 
         """
         # get all entities involved in combat by looking up their combathandlers
@@ -127,11 +141,18 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
             allies = [combatant]
             enemies = [comb for comb in combatants if comb != combatant]
         else:
-            # otherwise, enemies/allies depend on who combatant is
-            pcs = [comb for comb in combatants if inherits_from(comb, SUCharacter)]
-            npcs = [comb for comb in combatants if comb not in pcs]
-
-            if combatant in pcs:
+            # otherwise, enemies/allies depend on who combatant is. Split everyone in
+            # one pass; isinstance is a cheap C check where inherits_from compares paths.
+            # The split only changes when someone joins, so it's kept until then
+            sides = self.ndb.sides
+            if sides is None:
+                pcs, npcs = [], []
+                for comb in combatants:
+                    (pcs if isinstance(comb, SUCharacter) else npcs).append(comb)
+                sides = self.ndb.sides = (pcs, npcs)
+            pcs, npcs = sides
+
+            if isinstance(combatant, SUCharacter):
                 # combatant is a PC, so NPCs are all enemies
                 allies = pcs
                 enemies = npcs
@@ -154,7 +175,9 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
                 some future boost)
 
         """
-        self.advantage_against[target] = True
+        advantages = self.ndb.advantages
+        key = (recipient.id, target.id)
+        advantages[key] = advantages.get(key, 0) | _ADVANTAGE
 
     def give_disadvantage(self, recipient, target):
         """
@@ -166,7 +189,9 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
                 an enemy.
 
         """
-        self.disadvantage_against[target] = True
+        advantages = self.ndb.advantages
+        key = (recipient.id, target.id)
+        advantages[key] = advantages.get(key, 0) | _DISADVANTAGE
 
     def has_advantage(self, combatant, target):
         """
@@ -177,7 +202,9 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
             target (Character or NPC): The target to check advantage against.
 
         """
-        return self.advantage_against.get(target, False)
+        # nobody has dis/advantage in most fights, so don't build a key for nothing
+        advantages = self.ndb.advantages
+        return bool(advantages) and bool(advantages.get((combatant.id, target.id), 0) & _ADVANTAGE)
 
     def has_disadvantage(self, combatant, target):
         """
@@ -188,7 +215,9 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
             target (Character or NPC): The target to check disadvantage against.
 
         """
-        return self.disadvantage_against.get(target, False)
+        # nobody has dis/advantage in most fights, so don't build a key for nothing
+        advantages = self.ndb.advantages
+        return bool(advantages) and bool(advantages.get((combatant.id, target.id), 0) & _DISADVANTAGE)
 
     def at_repeat(self):
         self.process_queue()
@@ -219,15 +248,13 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
         dt = action_dict.get("dt", 1)  # Default to 1 delay if not provided
         time_to_act = time.time() + dt  # Current time + delay
 
-        # Add the action to the shared queue
-        self.db.action_queue.append({
-            "combatant": combatant,
-            "action_dict": action_dict,
-            "time_to_act": time_to_act
-        })
-
-        # Sort the queue by time_to_act to ensure the soonest actions are executed first
-        self.db.action_queue.sort(key=lambda x: x["time_to_act"])
+        # Add the action to the shared queue, keeping it sorted by time_to_act so the
+        # soonest actions are executed first
+        insort(
+            self.db.action_queue,
+            {"combatant": combatant, "action_dict": action_dict, "time_to_act": time_to_act},
+            key=_TIME_TO_ACT,
+        )
         '''
         # If delay > 0, schedule the next action using at_repeat
         if dt > 0:
@@ -262,10 +289,12 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
         """
         Execute the next action in the action queue.
         """
-        action_key = action_dict["key"]
-        action_class = self.action_classes.get(action_key)
+        action_class = self.action_classes.get(action_dict["key"])
 
-        if action_class:
+        if action_class is CombatActionHold:
+            # holding back does nothing, so there's no action to create
+            pass
+        elif action_class:
             action = action_class(self, combatant, action_dict)
 
             # Execute the action
@@ -278,14 +307,9 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
             print(f"{combatant}: Unknown action '{action_dict['key']}'.")
         # Re-queue the action if it is set to repeat
         if action_dict.get("repeat", True):
-            self.action_dict = action_dict
-            self.queue_action(self.action_dict, combatant)
-        elif action_dict.get("repeat", False):
-            self.action_dict = self.fallback_action_dict
-            self.queue_action(self.action_dict, combatant)
+            self.queue_action(action_dict, combatant)
 
-        if hasattr(combatant, "is_pc") and combatant.is_pc:
-            SUCharacter.update_stats(combatant)
+        combatant.update_stats(force=False)
 
         # Check if combat should continue
         self.check_stop_combat()
@@ -298,15 +322,24 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
         allies, enemies = self.get_sides(self.obj)
 
         location = self.obj.location
-        
-        # only keep combatants that are alive and still in the same room
-        active_allies = [comb for comb in allies if comb.hp > 0 and comb.location == location]
-        active_enemies = [comb for comb in enemies if comb.hp > 0 and comb.location == location]
 
-        # Identify losers: dead or not in the same location
-        defeated_allies = [comb for comb in allies if comb not in active_allies]
-        defeated_enemies = [comb for comb in enemies if comb not in active_enemies]
-        defeated = defeated_allies + defeated_enemies
+        def _is_active(comb):
+            return comb.hp > 0 and comb.location == location
+
+        # the usual case is that both sides still have someone standing, which any()
+        # finds after checking only a combatant or two per side
+        if any(map(_is_active, allies)) and any(map(_is_active, enemies)):
+            return
+
+        # one side is out; only keep combatants that are alive and still in the same
+        # room, everyone else is a loser
+        active_allies, active_enemies, defeated = [], [], []
+        for side, active in ((allies, active_allies), (enemies, active_enemies)):
+            for comb in side:
+                if _is_active(comb):
+                    active.append(comb)
+                else:
+                    defeated.append(comb)
 
         if not active_allies and not active_enemies:
             self.msg("Noone stands after the dust settles.", broadcast=False)
@@ -318,13 +351,14 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
             victors = active_allies + active_enemies  # Remaining combatants
             
             if victors:
-                # Announce victors
-                for victor in victors:                    
-                    for loser in defeated:
-                        # add more code here for what the loser gets!
-                        #loser.msg("|rYou have been defeated in combat!|n")
-                        SUMob.at_defeat(loser)
+                # each loser is defeated once, not once per victor
+                for loser in defeated:
+                    # add more code here for what the loser gets!
+                    #loser.msg("|rYou have been defeated in combat!|n")
+                    SUMob.at_defeat(loser)
 
+                # Announce victors
+                for victor in victors:
                     victor.msg("|gCongratulations! You are victorious in battle!|n")
                     if hasattr(victor, "is_pc") and victor.is_pc:
                         for loser in defeated: 
@@ -354,7 +388,7 @@ class SUCombatTwitchHandler(SUCombatBaseHandler):
             del combatant.ndb.combathandler  # Remove reference to the combat handler
             if hasattr(combatant, "is_pc") and combatant.is_pc:
                 combatant.ndb.combat = False
-                SUCharacter.update_stats(combatant)
+                combatant.update_stats()
         self.db.combatants.clear()
         self.db.action_queue.clear()
         self.obj.cmdset.remove(TwitchLookCmdSet)
@@ -392,13 +426,31 @@ class _BaseTwitchCombatCommand(Command):
         if not args:
             return
 
-        if " on " in args:
-            lhs, rhs = args.split(" on ", 1)
-        else:
-            lhs, *rhs = args.split(None, 1)
-            rhs = " ".join(rhs)
+        lhs, sep, rhs = args.partition(" on ")
+        if not sep:
+            lhs, _, rhs = args.partition(" ")
         self.lhs, self.rhs = lhs.strip(), rhs.strip()
 
+    def search_combatant(self, name):
+        """
+        Search for a combatant by name. "me" is what the stunt and use commands default
+        to, so while we are fighting that is resolved directly instead of going through
+        a search.
+
+        Args:
+            name (str): The name to search for.
+
+        Returns:
+            Object or None: The match, or None if the search failed (the caller has
+                been told why).
+
+        """
+        if name == "me":
+            combathandler = self.caller.ndb.combathandler
+            if combathandler and combathandler.id:
+                return self.caller
+        return self.caller.search(name)
+
     def get_or_create_combathandler(self, target=None):
         """
         Get or create the combathandler assigned to this combatant.
@@ -409,6 +461,12 @@ class _BaseTwitchCombatCommand(Command):
         #target = self.caller.search(self.lhs)
         combathandler_key=f"{combatant.name}_twitch_combathandler"
         
+        if target is None or target == combatant:
+            # nobody else is involved (hold, wield, look), so if we are already fighting
+            # there is nothing to create or merge
+            combathandler = combatant.ndb.combathandler
+            if combathandler and combathandler.id:
+                return combathandler
         if not target:
             combatant.msg("You can't find that target.")
             raise InterruptCommand()
@@ -438,6 +496,10 @@ class CmdAttack(_BaseTwitchCombatCommand):
     help_category = "combat"
 
     def func(self):
+        if not self.lhs:
+            # don't run a search for an empty target
+            self.msg("Attack whom?")
+            return
         target = self.caller.search(self.lhs)
         if not target:
             return
@@ -457,7 +519,7 @@ class CmdAttack(_BaseTwitchCombatCommand):
         combathandler.msg(f"$You() $conj(attack) $You({target})!", self.caller)
         if hasattr(self.caller, "is_pc") and self.caller.is_pc:
             self.caller.ndb.combat = True
-            SUCharacter.update_stats(self.caller)
+            self.caller.update_stats()
 
 class CmdUseItem(_BaseTwitchCombatCommand):
     """
@@ -494,13 +556,12 @@ class CmdUseItem(_BaseTwitchCombatCommand):
         if not item:
             self.msg("(You must carry the item to use it.)")
             return
-        if self.target:
-            target = self.caller.search(self.target)
-            if not target:
-                return
+        target = self.search_combatant(self.target)
+        if not target:
+            return
 
         combathandler = self.get_or_create_combathandler(target)
-        combathandler.queue_action({"key": "use", "item": item, "target": target, "dt": 3})
+        combathandler.queue_action({"key": "use", "item": item, "target": target, "dt": 3}, self.caller)
         combathandler.msg(
             f"$You() prepare to use {item.get_display_name(self.caller)}!", self.caller
         )
@@ -527,10 +588,11 @@ class CmdWield(_BaseTwitchCombatCommand):
     help_category = "combat"
 
     def parse(self):
+        # strip first, so whitespace-only input doesn't reach the search
+        super().parse()
         if not self.args:
             self.msg("What do you want to wield?")
             raise InterruptCommand()
-        super().parse()
 
     def func(self):
         item = self.caller.search(
@@ -540,19 +602,38 @@ class CmdWield(_BaseTwitchCombatCommand):
             self.msg("(You must carry the item to wield it.)")
             return
         combathandler = self.get_or_create_combathandler()
-        combathandler.queue_action({"key": "wield", "item": item, "dt": 3})
+        combathandler.queue_action({"key": "wield", "item": item, "dt": 3}, self.caller)
         combathandler.msg(f"$You() reach for {item.get_display_name(self.caller)}!", self.caller)
 
 class CmdLook(default_cmds.CmdLook, _BaseTwitchCombatCommand):
     
     def func(self):
-        # get regular look, followed by a combat summary
-        super().func()
-        if not self.args:
-            combathandler = self.get_or_create_combathandler(self.caller)
-            txt = str(combathandler.get_combat_summary(self.caller))
+        caller = self.caller
+        location = caller.location
+        combathandler = caller.ndb.combathandler
+        if self.args or not location or not (combathandler and combathandler.id):
+            # looking at something specific, or not fighting (anymore) - regular look
+            super().func()
+            return
+
+        # get regular look, followed by a combat summary, sent as one message
+        desc = caller.at_look(location)
+        txt = combathandler.get_combat_summary(caller)
+        # the summary is re-used until a row changes, and so is the header sized to it
+        cached = combathandler.ndb.summary_header
+        if cached and cached[0] is txt:
+            header = cached[1]
+        else:
             maxwidth = max(display_len(line) for line in txt.strip().split("\n"))
-            self.msg(f"|r{pad(' Combat Status ', width=maxwidth, fillchar='-')}|n\n{txt}")
+            header = pad(" Combat Status ", width=maxwidth, fillchar="-")
+            combathandler.ndb.summary_header = (txt, header)
+        self.msg(
+            text=(
+                f"{desc}\n|r{header}|n\n{txt}",
+                {"type": "look"},
+            ),
+            options=None,
+        )
 
 class CmdStunt(_BaseTwitchCombatCommand):
     """
@@ -592,22 +673,18 @@ class CmdStunt(_BaseTwitchCombatCommand):
 
         stunt_type, recipient, target = None, None, None
 
-        stunt_type, *args = args.split(None, 1)
-        if stunt_type:
-            stunt_type = stunt_type.strip().lower()
-
-        args = args[0] if args else ""
+        stunt_type, _, args = args.strip().partition(" ")
+        stunt_type = stunt_type.lower()
 
-        recipient, *args = args.split(None, 1)
-        target = args[0] if args else None
+        recipient, _, target = args.strip().partition(" ")
+        target = target.strip() or None
 
         # validate input and try to guess if not given
 
         # ability is requried
         if not stunt_type or stunt_type not in ABILITY_REVERSE_MAP:
             self.msg(
-                f"'{stunt_type}' is not a valid ability. Pick one of"
-                f" {', '.join(ABILITY_REVERSE_MAP.keys())}."
+                f"'{stunt_type}' is not a valid ability. Pick one of {_ABILITY_NAMES}."
             )
             raise InterruptCommand()
 
@@ -633,10 +710,10 @@ class CmdStunt(_BaseTwitchCombatCommand):
 
 
     def func(self):
-        target = self.caller.search(self.target)
+        target = self.search_combatant(self.target)
         if not target:
             return
-        recipient = self.caller.search(self.recipient)
+        recipient = self.search_combatant(self.recipient)
         if not recipient:
             return
 
@@ -652,6 +729,7 @@ class CmdStunt(_BaseTwitchCombatCommand):
                 "defense_type": self.stunt_type,
                 "dt": 3,
             },
+            self.caller,
         )
         combathandler.msg("$You() prepare a stunt!", self.caller)
 
@@ -668,7 +746,7 @@ class CmdHold(_BaseTwitchCombatCommand):
 
     def func(self):
         combathandler = self.get_or_create_combathandler()
-        combathandler.queue_action({"key": "hold"})
+        combathandler.queue_action({"key": "hold"}, self.caller)
         combathandler.msg("$You() $conj(hold) back, doing nothing.", self.caller)
 
 class TwitchCombatCmdSet(CmdSet):
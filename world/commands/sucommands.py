@@ -11,8 +11,13 @@ from world.utils.utils import get_obj_stats
 from world.character.characters import SUCharacter
 from evennia.utils import evform, evtable
 from evennia.contrib.rpg.health_bar import display_meter
+from copy import copy
 import time
 
+_EvForm = evform.EvForm
+_EvTable = evtable.EvTable
+
+
 class CmdWieldOrWear(MuxCommand):
     """
     Wield a weapon/shield, or wear a piece of armor or a helmet.
@@ -245,6 +250,29 @@ class CmdScore(MuxCommand):
     key = "score"
     aliases = "sc"
 
+    # the score form, created once on first use and copied for each score
+    _form_template = None
+
+    @classmethod
+    def get_form(cls):
+        """
+        Get a fresh score form to map data onto. The form is only created the first
+        time; after that we hand out copies with their own cell and table mappings so
+        the cached template is never mutated. Note that EvForm re-reads and re-parses
+        its template on every `.map()`, so each score still parses the form once.
+
+        Returns:
+            EvForm: A form ready for `.map()`.
+
+        """
+        if cls._form_template is None:
+            cls._form_template = _EvForm("world.forms.scoreform")
+        form = copy(cls._form_template)
+        form.cells_mapping = dict(cls._form_template.cells_mapping)
+        form.tables_mapping = dict(cls._form_template.tables_mapping)
+        form.options = dict(cls._form_template.options)
+        return form
+
     def func(self):
         if self.caller.check_permstring("Developer"): 
             if self.args:
@@ -266,39 +294,30 @@ class CmdScore(MuxCommand):
         else:
             target = self.caller
 
-        # create a new form from the template - using the python path
-        form = evform.EvForm("world.forms.scoreform")
-        if target.is_typeclass("world.character.characters.SUCharacter"):
+        # get a new form from the cached template
+        form = self.get_form()
+
+        if target.is_pc:
             account = target.account.name
-            level = int(target.level)
-            xp = int(target.xp)
+            permissions = target.perm_str
+            level, xp = int(target.level), int(target.xp)
         else:
             account = "NPC"
+            permissions = target.permissions
             level = "N/A"
             xp = "N/A"
 
-        # add data to each tagged form cell
-        form.map(cells={1: target.name,
-                        2: account,
-                        3: "Something",
-                        4: target.permissions,
-                        5: level,
-                        6: int(target.hp),
-                        7: int(target.hp_max),
-                        8: xp
-                        },
-                        align="r")
-
         # create the EvTables
-        tableA = evtable.EvTable("","Base","Mod","Total",
-                            table=[["STR", "DEX", "INT"],
-                            [int(target.strength), int(target.dexterity), int(target.intelligence)],
-                            [5, 5, 5],
-                            [5, 5, 5]],
+        abilities = [int(target.strength), int(target.dexterity), int(target.intelligence)]
+        tableA = _EvTable("","Base","Mod","Total",
+                            table=[["STR", "DEX", "INT"], abilities, [5] * 3, [5] * 3],
                             border="incols")
-        
-        # add the tables to the proper ids in the form
-        form.map(tables={"A": tableA })
+
+        # add data to each tagged form cell and the tables to the proper ids in the form,
+        # in a single map so the form is only rebuilt once
+        vals = (target.name, account, "Something", permissions,
+                level, int(target.hp), int(target.hp_max), xp)
+        form.map(cells=dict(zip(range(1, 9), vals)), tables={"A": tableA}, align="r")
         self.msg(str(form))
 
 class CmdRest(MuxCommand):
@@ -375,8 +394,8 @@ class CmdRestore(MuxCommand):
         if not self.args:
             # Restore all puppets
             puppets = [
-                obj for obj in self.caller.location.contents
-                if hasattr(obj, "account") and obj.account
+                obj for obj in self.caller.location.contents_get(content_type="character")
+                if obj.account
             ]
             if not puppets:
                 self.caller.msg("No puppeted characters found to restore.")
@@ -386,7 +405,7 @@ class CmdRestore(MuxCommand):
                 if hasattr(puppet.db, "hp") and hasattr(puppet.db, "hp_max"):
                     puppet.db.hp = puppet.db.hp_max
                     puppet.msg("Your HP has been fully restored.")
-                    SUCharacter.update_stats(puppet)
+                    puppet.update_stats()
             self.caller.msg("All puppeted characters have been restored to full HP.")
         else:
             # Restore a specific target
@@ -398,7 +417,7 @@ class CmdRestore(MuxCommand):
             if hasattr(target.db, "hp") and hasattr(target.db, "hp_max"):
                 target.db.hp = target.db.hp_max
                 target.msg("Your HP has been fully restored.")
-                SUCharacter.update_stats(target)
+                target.update_stats()
                 self.caller.msg(f"{target.key}'s HP has been fully restored.")
             else:
                 self.caller.msg(f"{target.key} does not have HP attributes to restore.")
@@ -649,9 +668,9 @@ class CmdParty(MuxCommand):
             self.caller.msg(f"|gYou have joined the party '{party_name}'.|n")
 
             # Notify the party members
-            for member in party_manager.get_party_members(party_name):
-                if member != self.caller:
-                    member.msg(f"|g{self.caller.key} has joined the party.|n")
+            party_manager.broadcast(
+                party_name, f"|g{self.caller.key} has joined the party.|n", exclude=[self.caller]
+            )
 
     def party_leave(self):
         """Handle leaving the party."""
@@ -675,33 +694,25 @@ class CmdParty(MuxCommand):
             return
         # Remove the caller from the party
         self.caller.db.party = None
-        
-        if party["leader_id"] == self.caller.id and len(party["member_ids"]) > 1:
-            # If the leader is leaving and there are remaining members
-            remaining_members = [member for member in party["member_ids"] if member != self.caller.id]
-            new_leader_id = remaining_members[0]  # Set the first member as the new leader
-            new_leader = ObjectDB.objects.get(id=new_leader_id)  # Retrieve the new leader object
-            party["leader_id"] = new_leader.id
-            new_leader.msg(f"|yYou are now the leader of the party '{party['name']}'.|n")
-        else:
-            # If the character is not the leader, just remove them from the party
-            if party_manager.remove_member_from_party(self.caller, party_name):
-                self.caller.msg(f"You have left the party '{party_name}'.")
-                remaining_members = party_manager.get_party_members(party_name)
-
-        """Remove a character from the PartyManager's list of members."""
-        if self.caller.id in party["member_ids"]:
-            party["member_ids"].remove(self.caller.id)
+        was_leader = party["leader_id"] == self.caller.id
+        if party_manager.remove_member_from_party(self.caller, party_name):
+            self.caller.msg(f"You have left the party '{party_name}'.")
 
         # Notify remaining members
-        for member in remaining_members:
-            #member = ObjectDB.objects.get(id=member_id)
-            member.msg(f"|y{self.caller.key} has left the party.|n")
+        remaining_members = party_manager.broadcast(party_name, f"|y{self.caller.key} has left the party.|n")
 
         # Disband the party if no members remain
         if not remaining_members:
             party_manager.remove_party(party_name)
             self.caller.msg(f"The party '{party_name}' has been disbanded.")
+            return
+
+        # Hand leadership to one of the remaining members if the leader left
+        if was_leader:
+            new_leader = remaining_members[0]
+            # re-fetch, since removing the member stored a fresh copy of the party
+            party_manager.get_party(party_name)["leader_id"] = new_leader.id
+            new_leader.msg(f"|yYou are now the leader of the party '{party_name}'.|n")
 
     def party_remove(self, target_name):
         """Handle removing a member from the party."""
@@ -747,11 +758,12 @@ class CmdParty(MuxCommand):
             self.caller.msg(f"|yYou have removed {target.key} from the party.|n")
 
         # Notify remaining members
-        for member in party_manager.get_party_members(party_name):
-            member.msg(f"|y{target.key} has been removed from the party by {self.caller.key}.|n")
+        remaining_members = party_manager.broadcast(
+            party_name, f"|y{target.key} has been removed from the party by {self.caller.key}.|n"
+        )
 
         # Disband the party if no members remain
-        if not party_manager.get_party_members(party_name):
+        if not remaining_members:
             party_manager.remove_party(party_name)
             self.caller.msg(f"The party '{party_name}' has been disbanded.")
 
@@ -799,9 +811,11 @@ class CmdParty(MuxCommand):
         target.msg(f"|gYou have been promoted to the leader of the party '{party_name}' by {self.caller.key}.|n")
 
         # Notify remaining members
-        for member in party_manager.get_party_members(party_name):
-            if member != target and member != self.caller:
-                member.msg(f"|y{target.key} has been promoted to the leader of the party by {self.caller.key}.|n")
+        party_manager.broadcast(
+            party_name,
+            f"|y{target.key} has been promoted to the leader of the party by {self.caller.key}.|n",
+            exclude=[target, self.caller],
+        )
 
     def party_disband(self):
         """Handle disbanding a party."""
@@ -865,12 +879,8 @@ class CmdParty(MuxCommand):
             self.caller.msg("Your party no longer exists.")
             return
 
-        # Get all party members
-        members = party_manager.get_party_members(party_name)
-
         # Send the message to all party members
-        for member in members:
-            member.msg(f"|c[Party] {self.caller.key}:|n {message}")
+        party_manager.broadcast(party_name, f"|c[Party] {self.caller.key}:|n {message}")
 
 # Helper functions
 def display_party_status(character):
@@ -903,7 +913,7 @@ def display_party_status(character):
         return f"The party '{party_name}' has no members."
 
     # Build the table (same as before)
-    table = evtable.EvTable("|cMember|n", "|cHealth|n", "|cRole|n", border="cells")
+    table = _EvTable("|cMember|n", "|cHealth|n", "|cRole|n", border="cells")
     for member in members:
         if not member:
             continue
@@ -954,7 +964,7 @@ class CmdParties(MuxCommand):
             return
 
         # Prepare the table
-        table = evtable.EvTable("|cParty Name|n", "|cLeader|n", "|cMembers|n", border="cells")
+        table = _EvTable("|cParty Name|n", "|cLeader|n", "|cMembers|n", border="cells")
 
         for party_name, party_data in parties.items():
             # Get leader and members
@@ -1043,7 +1053,7 @@ class CmdListDungeons(MuxCommand):
             return
 
         # Create table
-        table = evtable.EvTable("Reference", "Name", "Creator", "Expire")
+        table = _EvTable("Reference", "Name", "Creator", "Expire")
          
         for dungeon in active_dungeons:
             dungeon_number = active_dungeons[dungeon].dbref
@@ -1137,7 +1147,7 @@ class CmdRift(MuxCommand):
         """
         Starts a menu for dungeon selection and generation.
         """
-        completed_dungeons = character.db.completed_dungeons or []
+        completed_dungeons = character.completed_dungeons
         available_templates = self.get_available_dungeon_templates(completed_dungeons) if completed_dungeons else ["main_dungeon"]
         if not available_templates:
             character.msg("Something wrong.")
@@ -1177,8 +1187,7 @@ class CmdRift(MuxCommand):
                             connecting_room=self.caller.location,
                         )
                         caller.msg(f"You feel a magical pull as the {sub_dungeon} materializes before you.")
-                        if sub_dungeon not in caller.db.completed_dungeons:
-                            caller.db.completed_dungeons.append(sub_dungeon)
+                        caller.completed_dungeons.add(sub_dungeon)
                         return None
                 else:
                     caller.msg("There seems to be a glitch... no DungeonManager found.")
@@ -1201,7 +1210,7 @@ class CmdRift(MuxCommand):
         Get a list of dungeon templates available to the character.
 
         Args:
-            completed_dungeons (list): A list of completed dungeon template identifiers.
+            completed_dungeons (set): The completed dungeon template identifiers.
 
         Returns:
             list: A list of available dungeon templates.
@@ -1214,7 +1223,7 @@ class CmdRift(MuxCommand):
 
         templates = dungeon_manager.get_templates()
         #print(f"All Templates: {templates}")
-        available_templates = list(set(templates) & set(completed_dungeons)) #[template for template in templates if template.get("key") not in completed_dungeons]
+        available_templates = [template for template in templates if template in completed_dungeons] #[template for template in templates if template.get("key") not in completed_dungeons]
         #print(f"Available Templates: {available_templates}")
         return available_templates
 
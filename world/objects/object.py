@@ -132,10 +132,9 @@ class SUWeapon(SUObject):
             advantage=advantage,
             disadvantage=disadvantage,
         )
-        location.msg_contents(
-            f"$You() $conj(attack) $You({target.key}) with {self.key}.", #: {txt}
-            from_obj=attacker, mapping={target.key: target},
-        )
+        # the attack and its outcome go out to the room as one message
+        tkey = target.key
+        message = f"$You() $conj(attack) $You({tkey}) with {self.key}.\n"  #: {txt}
         if is_hit:
             # enemy hit, calculate damage
             dmg = rules.dice.roll(self.damage_roll)
@@ -143,25 +142,22 @@ class SUWeapon(SUObject):
             if quality is Ability.CRITICAL_SUCCESS:
                 # double damage roll for critical success
                 dmg += rules.dice.roll(self.damage_roll)
-                message = (
-                    f" $You() |ycritically|n |g$conj(hit)|n $You({target.key}) for |r{dmg}|n damage!"
-                )
+                message += f" $You() |ycritically|n |g$conj(hit)|n $You({tkey}) for |r{dmg}|n damage!"
             else:
-                message = f" $You() |g$conj(hit)|n $You({target.key}) for |r{dmg}|n damage!"
-
-            location.msg_contents(message, from_obj=attacker, mapping={target.key: target})
-            # call hook
-            target.at_damage(dmg, attacker=attacker)
-
+                message += f" $You() |g$conj(hit)|n $You({tkey}) for |r{dmg}|n damage!"
         else:
         # a miss
-            message = f" $You() |r$conj(miss)|n $You({target.key})."
+            message += f" $You() |r$conj(miss)|n $You({tkey})."
             # Not using object durability for now
             #if quality is Ability.CRITICAL_FAILURE:
             #    message += ".. it's a |rcritical miss!|n, damaging the weapon."
             #if self.quality is not None:
             #    self.quality -= 1
-            location.msg_contents(message, from_obj=attacker, mapping={target.key: target})
+
+        location.msg_contents(message, from_obj=attacker, mapping={tkey: target})
+        if is_hit:
+            # call hook
+            target.at_damage(dmg, attacker=attacker)
 
     def at_post_use(self, user, *args, **kwargs):
         pass
@@ -215,9 +211,9 @@ class WeaponBareHands(SUWeapon):
     quality = None  # let's assume fists are indestructible ...
 
 def get_bare_hands(): 
-    """Get the bare hands""" 
+    """Get the bare hands, only searching for them the first time (or again if deleted).""" 
     global _BARE_HANDS
-    if not _BARE_HANDS: 
+    if _BARE_HANDS is None or not _BARE_HANDS.pk:
         _BARE_HANDS = search_object("bare hands", typeclass=WeaponBareHands).first()
     if not _BARE_HANDS:
         _BARE_HANDS = create_object(WeaponBareHands, key="bare hands")
@@ -1,8 +1,6 @@
 
 from evennia.objects.objects import DefaultRoom
 
-from copy import deepcopy
-
 from evennia import AttributeProperty, DefaultCharacter, search_script
 from evennia.utils.utils import inherits_from
 from evennia.utils.evmenu import EvMenu
@@ -32,6 +30,36 @@ _EXIT_GRID_SHIFT = {
     "northwest": (-1, 1, "\\"),
 }
 
+def render_map(room):
+    """
+    Build the mini-map for a room, showing the exits out of it and the rooms they
+    lead to.
+
+    Args:
+        room (Room): The room at the center of the map.
+
+    Returns:
+        str: The map, ready to be shown.
+
+    """
+    map_grid = [row[:] for row in _MAP_GRID]
+    dx0, dy0 = 2, 2
+    map_grid[dy0][dx0] = CHAR_SYMBOL
+    for exi in room.exits:
+        dx, dy, symbol = _EXIT_GRID_SHIFT.get(exi.key, (None, None, None))
+        if symbol is None:
+            # we have a non-cardinal direction to go to - indicate this
+            map_grid[dy0][dx0] = CHAR_ALT_SYMBOL
+            continue
+        map_grid[dy0 + dy][dx0 + dx] = f"{LINK_COLOR}{symbol}|n"
+        if exi.destination != room:
+            map_grid[dy0 + dy + dy][dx0 + dx + dx] = ROOM_SYMBOL
+
+    # Note that on the grid, dy is really going *downwards* (origo is
+    # in the top left), so we need to reverse the order at the end to mirror it
+    # vertically and have it come out right.
+    return "  " + "\n  ".join("".join(line) for line in reversed(map_grid))
+
 class SURoom(DefaultRoom):
     """
     Simple room supporting some SU-specifics.
@@ -58,24 +86,14 @@ class SURoom(DefaultRoom):
         ):
             return ""
 
-        # build a map
-        map_grid = deepcopy(_MAP_GRID)
-        dx0, dy0 = 2, 2
-        map_grid[dy0][dx0] = CHAR_SYMBOL
-        for exi in self.exits:
-            dx, dy, symbol = _EXIT_GRID_SHIFT.get(exi.key, (None, None, None))
-            if symbol is None:
-                # we have a non-cardinal direction to go to - indicate this
-                map_grid[dy0][dx0] = CHAR_ALT_SYMBOL
-                continue
-            map_grid[dy0 + dy][dx0 + dx] = f"{LINK_COLOR}{symbol}|n"
-            if exi.destination != self:
-                map_grid[dy0 + dy + dy][dx0 + dx + dx] = ROOM_SYMBOL
-
-        # Note that on the grid, dy is really going *downwards* (origo is
-        # in the top left), so we need to reverse the order at the end to mirror it
-        # vertically and have it come out right.
-        return "  " + "\n  ".join("".join(line) for line in reversed(map_grid))
+        # the map only depends on the exits out of the room, so it is the same for
+        # every looker. Re-render it only when an exit has been added, removed, renamed
+        # (the name gives its direction on the map) or re-pointed since the last look.
+        exits = tuple((exi, exi.key, exi.destination) for exi in self.exits)
+        cached = self.ndb.map_cache
+        if not cached or cached[0] != exits:
+            cached = self.ndb.map_cache = (exits, render_map(self))
+        return cached[1]
 
 class SUEntryRoom(SURoom):
     """
@@ -101,8 +119,7 @@ class SUEntryRoom(SURoom):
                             connecting_room=self,
                         )
                         obj.msg(f"You feel a magical pull as the {sub_dungeon} materializes before you.")
-                        if sub_dungeon not in obj.db.completed_dungeons:
-                            obj.db.completed_dungeons.append(sub_dungeon)
+                        obj.completed_dungeons.add(sub_dungeon)
                 else:
                     obj.msg("There seems to be a glitch... no DungeonManager found.")
             else:
@@ -1,5 +1,4 @@
 from evennia import DefaultScript
-from world.character.characters import SUCharacter
 
 class RestingScript(DefaultScript):
     """
@@ -32,7 +31,7 @@ class RestingScript(DefaultScript):
                 # Heal 1 HP per interval (customize as needed)
                 character.db.hp += 1
                 # Need to add function to update stats and eventually the prompt
-                SUCharacter.update_stats(character)
+                character.update_stats(force=False)
                 character.msg(f"|435As you meditate deeply on your life, you feel regenerated and restored.|n")
 
                 # Prevent over-healing
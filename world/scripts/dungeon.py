@@ -148,8 +148,7 @@ class DungeonManager(DefaultScript):
             "start_time" : time.time(),
         }
         character = ObjectDB.objects.get(db_key=creator)
-        if template_name not in character.db.completed_dungeons:
-            character.db.completed_dungeons.append(template_name)
+        character.completed_dungeons.add(template_name)
         self.db.active_dungeons[dungeon.db.dungeon_attributes["dungeon_num"]] = dungeon
 
     def get_dungeon_key(self, identifier):
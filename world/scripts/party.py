@@ -71,9 +71,26 @@ class PartyManager(DefaultScript):
         party = self.get_party(party_name)
         if not party:
             return []
-        return [
-            obj for obj in ObjectDB.objects.filter(id__in=party["member_ids"])
-        ]
+        return list(ObjectDB.objects.in_bulk(party["member_ids"]).values())
+
+    def broadcast(self, party_name, text, exclude=None):
+        """
+        Send a message to every member of a party.
+
+        Args:
+            party_name (str): The name of the party.
+            text (str): The message to send.
+            exclude (list, optional): Members that should not get the message.
+
+        Returns:
+            list: The members of the party, so callers don't have to look them up again.
+        """
+        members = self.get_party_members(party_name)
+        exclude = exclude or ()
+        for member in members:
+            if member not in exclude:
+                member.msg(text)
+        return members
 
     def remove_member_from_party(self, member, party_name):
         """Remove a member from a party."""
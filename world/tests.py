@@ -0,0 +1,48 @@
+"""
+Tests for the world package. Run with `evennia test --settings settings.py .`
+
+"""
+
+from evennia.utils import create
+from evennia.utils.test_resources import EvenniaCommandTest
+
+from world.character.characters import SUCharacter
+from world.combat import multi_party_combat_twitch as combat
+
+
+class TestTwitchCombatCommands(EvenniaCommandTest):
+    """
+    Combat commands that only act on the caller, run while already fighting.
+
+    """
+
+    character_typeclass = SUCharacter
+    room_typeclass = "world.rooms.rooms.SUPvPRoom"
+
+    def setUp(self):
+        super().setUp()
+        self.sword = create.create_object("world.objects.object.SUWeapon", key="sword")
+        self.sword.move_to(self.char1, quiet=True)
+        # start a fight, so there is a combathandler to queue actions in
+        self.call(combat.CmdAttack(), "Char2", "You join combat!")
+        self.combathandler = self.char1.ndb.combathandler
+
+    def tearDown(self):
+        if self.combathandler.id:
+            self.combathandler.delete()
+        super().tearDown()
+
+    def _queued(self, key):
+        return [
+            action
+            for action in self.combathandler.db.action_queue
+            if action["combatant"] == self.char1 and action["action_dict"]["key"] == key
+        ]
+
+    def test_hold(self):
+        self.call(combat.CmdHold(), "", "You hold back, doing nothing.")
+        self.assertEqual(len(self._queued("hold")), 1)
+
+    def test_wield(self):
+        self.call(combat.CmdWield(), "sword", "You reach for sword!")
+        self.assertEqual(self._queued("wield")[0]["action_dict"]["item"], self.sword)
@@ -1,4 +1,6 @@
 import random
+from functools import lru_cache
+from itertools import accumulate
 
 _OBJ_STATS = """
 |c{key}|n
@@ -47,25 +49,25 @@ def get_obj_stats(obj, owner=None):
         damage_roll=getattr(obj, "damage_roll", "None"),
     )
 
-def random_probability(self, probabilities):
+@lru_cache(maxsize=None)
+def _cumulative_probabilities(items):
+    """
+    Split `(key, probability)` pairs into the keys and their running totals, so
+    `random.choices` can pick from them without re-summing.
+
+    """
+    keys, probs = zip(*items)
+    return keys, tuple(accumulate(probs))
+
+def random_probability(probabilities):
     """
     Given a dictionary of probabilities, return the key of the chosen probability.
 
     Args:
         probabilities (dict): A dictionary of probabilities, where the key is the action and the
-            value is the probability of that action.
+            value is the probability of that action. They don't need to add up to 1.
 
     """
-    r = random.random()
-    # sort probabilities from higheest to lowest, making sure to normalize them 0..1
-    prob_total = sum(probabilities.values())
-    sorted_probs = sorted(
-        ((key, prob / prob_total) for key, prob in probabilities.items()),
-        key=lambda x: x[1],
-        reverse=True,
-    )
-    total = 0
-    for key, prob in sorted_probs:
-        total += prob
-        if r <= total:
-            return key
+    # the tables are usually class-level constants, so the running totals are cached
+    keys, cum_probs = _cumulative_probabilities(tuple(probabilities.items()))
+    return random.choices(keys, cum_weights=cum_probs)[0]